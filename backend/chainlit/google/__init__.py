@@ -11,15 +11,65 @@ SDK client is instantiated. The same hooks also cover Agent Developer Kit
 from __future__ import annotations
 
 import asyncio
+import functools
 import inspect
+import sys
 import time
-from typing import Any, Callable, Dict, Iterable, Optional
-
-from chainlit.context import ChainlitContextException, get_context, local_steps
+import types
+import weakref
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from chainlit.context import ChainlitContext, context_var
+from chainlit.logger import logger
 from chainlit.step import Step
 from chainlit.utils import timestamp_utc
 
 _STEP_SENTINEL_ATTR = "__chainlit_google_instrumented__"
+# Client components and the methods that produce LLM steps.
+_INSTRUMENT_SPEC: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("responses", ("generate",)),
+    ("models", ("generate_content", "generate", "create_completion")),
+    ("agents", ("create", "update", "delete", "execute", "query")),
+    ("sessions", ("generate", "generate_content", "execute")),
+    ("tools", ("execute",)),
+)
+# Methods that are not recorded when they carry no prompt and return nothing.
+_SILENT_METHODS = frozenset({"delete", "update"})
+# Instrumentable methods exposed by each SDK component class, discovered on the
+# first client so later clients skip probing names the component lacks.
+_COMPONENT_METHODS: weakref.WeakKeyDictionary[type, Dict[str, Tuple[str, ...]]] = (
+    weakref.WeakKeyDictionary()
+)
+_STREAM_RESULT_TYPES = (types.GeneratorType, types.AsyncGeneratorType)
+# Depth limits for ``_simplify``. The output fallback only runs when no text
+# could be extracted, so it is kept shallow to avoid walking whole responses.
+_SIMPLIFY_MAX_DEPTH = 32
+_OUTPUT_SIMPLIFY_MAX_DEPTH = 4
+
+# Lookup keys used by the extractors.
+_MISSING = object()
+_MODEL_KWARG = "model"
+_MODEL_ATTRS = ("model", "model_name", "model_version")
+_PROMPT_KWARGS = ("contents", "messages", "prompt", "input", "text")
+_PROMPT_ARG_TYPES = (str, list, dict)
+_OUTPUT_ATTRS = ("output_text", "text", "response_text")
+
+# Recorded steps are queued per event loop and drained by one flusher task
+# per loop, which lives until its queue is empty, instead of spawning one task
+# per SDK call.
+_PendingStep = Tuple[Step, ChainlitContext, float, float]
+_step_queues: Dict[
+    asyncio.AbstractEventLoop, Tuple[Deque[_PendingStep], asyncio.Task[None]]
+] = {}
 
 
 def instrument_google_genai() -> None:
@@ -34,6 +84,10 @@ def instrument_google_genai() -> None:
 
     sdk, client_class, async_client_class = _locate_google_sdk()
 
+    # Repeated calls are no-ops once the SDK module has been instrumented.
+    if getattr(sdk, _STEP_SENTINEL_ATTR, False):
+        return
+
     if client_class is None and async_client_class is None:
         raise ValueError(
             "Expected either google-genai (preferred) or google-generativeai to be "
@@ -47,10 +101,21 @@ def instrument_google_genai() -> None:
     if async_client_class is not None:
         _patch_client_class(async_client_class)
 
+    setattr(sdk, _STEP_SENTINEL_ATTR, True)
+
 
 def _locate_google_sdk():
     """Return the loaded Google GenAI SDK module and client classes."""
 
+    # The currently loaded modules are part of the cache key so that replacing
+    # or reloading them invalidates the lookup.
+    return _locate_google_sdk_cached(
+        sys.modules.get("google.genai"), sys.modules.get("google.generativeai")
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _locate_google_sdk_cached(genai_module: Any, legacy_module: Any):
     try:
         from google import genai as sdk  # type: ignore
     except Exception:
@@ -110,107 +175,114 @@ def _patch_legacy_sdk(legacy_sdk: Any) -> None:
     for name, fn in generate_fns:
         if getattr(fn, _STEP_SENTINEL_ATTR, False):
             continue
-        wrapped = _wrap_callable(fn, interface="legacy", method=name)
-        setattr(legacy_sdk, name, wrapped)
+        wrapped = _wrap(fn, interface="legacy", method=name)
         setattr(wrapped, _STEP_SENTINEL_ATTR, True)
+        setattr(legacy_sdk, name, wrapped)
 
     setattr(legacy_sdk, _STEP_SENTINEL_ATTR, True)
 
 
 def _instrument_client_instance(client: Any) -> None:
-    for attr_name, method_names in {
-        "responses": ("generate",),
-        "models": ("generate_content", "generate", "create_completion"),
-        "agents": (
-            "create",
-            "update",
-            "delete",
-            "execute",
-            "query",
-        ),
-        "sessions": ("generate", "generate_content", "execute"),
-        "tools": ("execute",),
-    }.items():
+    for attr_name, method_names in _INSTRUMENT_SPEC:
         component = getattr(client, attr_name, None)
         if not component:
             continue
 
-        for method_name in method_names:
+        for method_name in _component_methods(component, attr_name, method_names):
             method = getattr(component, method_name, None)
             if method is None:
                 continue
             if getattr(method, _STEP_SENTINEL_ATTR, False):
                 continue
 
-            wrapped = _wrap_bound_method(
-                method, interface=attr_name, method=method_name
-            )
+            wrapped = _wrap(method, interface=attr_name, method=method_name)
+            setattr(wrapped, _STEP_SENTINEL_ATTR, True)
             setattr(component, method_name, wrapped)
-            setattr(getattr(component, method_name), _STEP_SENTINEL_ATTR, True)
-
 
-def _wrap_bound_method(
-    bound_method: Callable[..., Any], *, interface: str, method: str
-):
-    is_coroutine = asyncio.iscoroutinefunction(bound_method)
-
-    async def _async_wrapper(*args, **kwargs):
-        start = time.time()
-        result = await bound_method(*args, **kwargs)
-        _record_generation(interface, method, args, kwargs, result, start)
-        return result
 
-    def _sync_wrapper(*args, **kwargs):
-        start = time.time()
-        result = bound_method(*args, **kwargs)
+def _component_methods(
+    component: Any, attr_name: str, method_names: Tuple[str, ...]
+) -> Tuple[str, ...]:
+    """Return the ``method_names`` that ``component`` actually exposes."""
 
-        if inspect.isawaitable(result):
-            async def _await_and_record():
-                awaited = await result
-                _record_generation(interface, method, args, kwargs, awaited, start)
-                return awaited
-
-            return _await_and_record()
-
-        if inspect.isgenerator(result) or inspect.isasyncgen(result):
+    known = _COMPONENT_METHODS.setdefault(type(component), {})
+    found = known.get(attr_name)
+    if found is None:
+        found = known[attr_name] = tuple(
+            name for name in method_names if getattr(component, name, None) is not None
+        )
+    return found
+
+
+def _is_coroutine_function(target: Callable[..., Any]) -> bool:
+    # Plain ``async def`` functions and methods carry the CO_COROUTINE flag on
+    # their code object. Only fall back to asyncio's slower check (partials,
+    # ``__wrapped__`` chains, legacy markers) when the flag is absent.
+    code = getattr(getattr(target, "__func__", target), "__code__", None)
+    if code is not None and code.co_flags & inspect.CO_COROUTINE:
+        return True
+    return asyncio.iscoroutinefunction(target)
+
+
+def _wrap(target: Callable[..., Any], *, interface: str, method: str):
+    # Decide the wrapper shape once at wrap time so SDK calls never pay for
+    # ``inspect`` predicates on the hot path. Calls made outside a Chainlit
+    # session go straight to the SDK without timing or extraction.
+    if _is_coroutine_function(target):
+
+        @functools.wraps(target)
+        async def _async_wrapper(*args, **kwargs):
+            if context_var.get(None) is None:
+                return await target(*args, **kwargs)
+
+            start = time.time()
+            start_monotonic = time.monotonic()
+            result = await target(*args, **kwargs)
+            _record_generation(
+                interface, method, args, kwargs, result, start, start_monotonic
+            )
             return result
 
-        _record_generation(interface, method, args, kwargs, result, start)
-        return result
+        return _async_wrapper
 
-    return _async_wrapper if is_coroutine else _sync_wrapper
+    if inspect.isgeneratorfunction(target) or inspect.isasyncgenfunction(target):
 
+        @functools.wraps(target)
+        def _sync_returns_generator(*args, **kwargs):
+            return target(*args, **kwargs)
 
-def _wrap_callable(
-    callable_obj: Callable[..., Any], *, interface: str, method: str
-):
-    is_coroutine = asyncio.iscoroutinefunction(callable_obj)
+        return _sync_returns_generator
 
-    async def _async_wrapper(*args, **kwargs):
-        start = time.time()
-        result = await callable_obj(*args, **kwargs)
-        _record_generation(interface, method, args, kwargs, result, start)
-        return result
+    @functools.wraps(target)
+    def _sync_returns_value(*args, **kwargs):
+        if context_var.get(None) is None:
+            return target(*args, **kwargs)
 
-    def _sync_wrapper(*args, **kwargs):
         start = time.time()
-        result = callable_obj(*args, **kwargs)
+        start_monotonic = time.monotonic()
+        result = target(*args, **kwargs)
+
+        result_type = type(result)
+        if hasattr(result_type, "__await__"):
 
-        if inspect.isawaitable(result):
             async def _await_and_record():
                 awaited = await result
-                _record_generation(interface, method, args, kwargs, awaited, start)
+                _record_generation(
+                    interface, method, args, kwargs, awaited, start, start_monotonic
+                )
                 return awaited
 
             return _await_and_record()
 
-        if inspect.isgenerator(result) or inspect.isasyncgen(result):
+        if result_type in _STREAM_RESULT_TYPES:
             return result
 
-        _record_generation(interface, method, args, kwargs, result, start)
+        _record_generation(
+            interface, method, args, kwargs, result, start, start_monotonic
+        )
         return result
 
-    return _async_wrapper if is_coroutine else _sync_wrapper
+    return _sync_returns_value
 
 
 def _record_generation(
@@ -220,23 +292,32 @@ def _record_generation(
     kwargs: Dict[str, Any],
     result: Any,
     start_time: float,
+    start_monotonic: float,
 ) -> None:
-    try:
-        ctx = get_context()
-    except ChainlitContextException:
-        ctx = None
+    # Probe the context variable directly: get_context() raises when there is
+    # no session, and raising/catching on every SDK call is costly.
+    ctx = context_var.get(None)
 
-    parent_id: Optional[str] = None
-    if ctx and ctx.current_step:
-        parent_id = ctx.current_step.id
-    elif (previous_steps := local_steps.get() or []) and previous_steps:
-        parent_id = previous_steps[-1].id
+    # Outside of a Chainlit session there is nothing to attach the step to, so
+    # skip the extraction work (and the Step, which requires a session).
+    if ctx is None:
+        return
+
+    parent_id = ctx.current_step.id if ctx.current_step else None
 
-    model = _extract_model(args, kwargs, result)
     prompt = _extract_prompt(args, kwargs)
     output = _extract_output(result)
 
-    end_time = time.time()
+    # Housekeeping calls with neither a prompt nor a result would only add
+    # empty steps to the UI.
+    if prompt is None and output is None and method in _SILENT_METHODS:
+        return
+
+    model = _extract_model(args, kwargs, result)
+
+    # Derive the end timestamp from the monotonic clock instead of reading the
+    # wall clock a second time.
+    end_time = start_time + (time.monotonic() - start_monotonic)
 
     step = Step(
         name=model or _default_step_name(interface, method),
@@ -254,19 +335,72 @@ def _record_generation(
         else {"args": _simplify(args), "kwargs": _simplify(kwargs)}
     )
     step.output = output
+
+    _queue_step_send((step, ctx, start_time, end_time))
+
+
+def _queue_step_send(pending: _PendingStep) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync SDK calls run in worker threads, hand the step over to the
+        # session loop so it is flushed there.
+        pending[1].loop.call_soon_threadsafe(_queue_step_send, pending)
+        return
+
+    entry = _step_queues.get(loop)
+    if entry is None:
+        queue: Deque[_PendingStep] = deque()
+        _step_queues[loop] = (queue, loop.create_task(_flush_pending_steps(loop)))
+    else:
+        queue = entry[0]
+    queue.append(pending)
+
+
+async def _flush_pending_steps(loop: asyncio.AbstractEventLoop) -> None:
+    queue = _step_queues[loop][0]
+    try:
+        while queue:
+            # Steps usually belong to different sessions, so one slow socket
+            # must not hold back the rest of the batch.
+            batch = list(queue)
+            queue.clear()
+            await asyncio.gather(*(_send_step(*pending) for pending in batch))
+    finally:
+        del _step_queues[loop]
+
+
+async def _send_step(
+    step: Step,
+    ctx: ChainlitContext,
+    start_time: float,
+    end_time: float,
+) -> None:
+    # Timestamps are formatted here rather than on the SDK call path.
     step.start = timestamp_utc(start_time)
     step.end = timestamp_utc(end_time)
 
-    asyncio.create_task(step.send())
+    # The flusher outlives the call that recorded the step, so restore that
+    # call's Chainlit context before emitting.
+    token = context_var.set(ctx)
+    try:
+        await step.send()
+    except Exception as e:
+        logger.error(f"Failed to send Google GenAI step: {e!s}")
+    finally:
+        context_var.reset(token)
 
 
 def _default_step_name(interface: str, method: str) -> str:
     return f"google::{interface}.{method}"
 
 
-def _extract_model(args: Iterable[Any], kwargs: Dict[str, Any], result: Any) -> Optional[str]:
-    if "model" in kwargs and isinstance(kwargs["model"], str):
-        return kwargs["model"]
+def _extract_model(
+    args: Iterable[Any], kwargs: Dict[str, Any], result: Any
+) -> Optional[str]:
+    model = kwargs.get(_MODEL_KWARG)
+    if isinstance(model, str):
+        return model
 
     for value in args:
         if isinstance(value, str) and value.startswith("models/"):
@@ -274,7 +408,7 @@ def _extract_model(args: Iterable[Any], kwargs: Dict[str, Any], result: Any) ->
         if isinstance(value, dict) and isinstance(value.get("model"), str):
             return value["model"]
 
-    for attr in ("model", "model_name", "model_version"):
+    for attr in _MODEL_ATTRS:
         candidate = getattr(result, attr, None)
         if isinstance(candidate, str):
             return candidate
@@ -283,12 +417,13 @@ def _extract_model(args: Iterable[Any], kwargs: Dict[str, Any], result: Any) ->
 
 
 def _extract_prompt(args: Iterable[Any], kwargs: Dict[str, Any]) -> Any:
-    for key in ("contents", "messages", "prompt", "input", "text"):
-        if key in kwargs:
-            return _simplify(kwargs[key])
+    for key in _PROMPT_KWARGS:
+        value = kwargs.get(key, _MISSING)
+        if value is not _MISSING:
+            return _simplify(value)
 
     for value in args:
-        if isinstance(value, (str, list, dict)):
+        if isinstance(value, _PROMPT_ARG_TYPES):
             return _simplify(value)
 
     return None
@@ -298,7 +433,7 @@ def _extract_output(result: Any) -> Any:
     if result is None:
         return None
 
-    for attr in ("output_text", "text", "response_text"):
+    for attr in _OUTPUT_ATTRS:
         candidate = getattr(result, attr, None)
         if isinstance(candidate, str) and candidate:
             return candidate
@@ -324,8 +459,7 @@ def _extract_output(result: Any) -> Any:
 
     if hasattr(result, "response") and hasattr(result.response, "output_text"):
         try:
-            response = result.response
-            output_text = getattr(response, "output_text", None)
+            output_text = getattr(result.response, "output_text", None)
             if isinstance(output_text, str):
                 return output_text
         except Exception:
@@ -334,25 +468,65 @@ def _extract_output(result: Any) -> Any:
     if isinstance(result, (str, int, float, bool)):
         return result
 
-    return _simplify(result)
+    return _simplify(result, max_depth=_OUTPUT_SIMPLIFY_MAX_DEPTH)
+
 
+def _simplify(value: Any, max_depth: int = _SIMPLIFY_MAX_DEPTH, depth: int = 0) -> Any:
+    """Convert ``value`` into JSON friendly primitives.
 
-def _simplify(value: Any) -> Any:
-    if isinstance(value, (str, int, float, bool)) or value is None:
+    Nodes nested deeper than ``max_depth`` are rendered with ``repr``, which
+    also stops self-referencing objects from recursing forever.
+    """
+
+    value_type = type(value)
+    if value_type in _SIMPLIFY_SCALAR_TYPES:
+        return value
+    if depth > max_depth:
+        return value if _simplify_kind(value_type) is _SCALAR else repr(value)
+
+    depth += 1
+    if value_type is dict:
+        return {str(k): _simplify(v, max_depth, depth) for k, v in value.items()}
+    if value_type is list:
+        return [_simplify(v, max_depth, depth) for v in value]
+
+    kind = _simplify_kind(value_type)
+    if kind is _SCALAR:
         return value
-    if isinstance(value, dict):
-        return {str(k): _simplify(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [_simplify(v) for v in value]
+    if kind is _MAPPING:
+        return {str(k): _simplify(v, max_depth, depth) for k, v in value.items()}
+    if kind is _SEQUENCE:
+        return [_simplify(v, max_depth, depth) for v in value]
+    if kind is _MODEL:
+        try:
+            dumped = value.model_dump().items()
+        except Exception:
+            pass
+        else:
+            return {str(k): _simplify(v, max_depth, depth) for k, v in dumped}
     if hasattr(value, "__dict__"):
         return {
-            key: _simplify(val)
+            key: _simplify(val, max_depth, depth)
             for key, val in vars(value).items()
             if not key.startswith("_")
         }
-    if hasattr(value, "model_dump"):
-        try:
-            return _simplify(value.model_dump())  # type: ignore[attr-defined]
-        except Exception:
-            pass
     return repr(value)
+
+
+_SIMPLIFY_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+_SCALAR, _MAPPING, _SEQUENCE, _MODEL, _OBJECT = range(5)
+
+
+@functools.lru_cache(maxsize=256)
+def _simplify_kind(value_type: type) -> int:
+    """Classify ``value_type`` once so ``_simplify`` skips repeated isinstance checks."""
+
+    if issubclass(value_type, (str, int, float, bool)):
+        return _SCALAR
+    if issubclass(value_type, dict):
+        return _MAPPING
+    if issubclass(value_type, (list, tuple, set)):
+        return _SEQUENCE
+    if callable(getattr(value_type, "model_dump", None)):
+        return _MODEL
+    return _OBJECT
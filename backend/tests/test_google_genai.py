@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 import sys
 import types
 from typing import Any, Dict, List
@@ -30,6 +31,25 @@ class _FakeClient:
         self.responses = _FakeResponses()
 
 
+class _FakeAsyncResponses:
+    async def generate(self, *, model: str, contents: str):
+        return _FakeResponse(model=model, text=f"async:{contents}")
+
+    def stream(self, *, model: str, contents: str):
+        yield _FakeResponse(model=model, text=f"chunk:{contents}")
+
+
+class _FakeAsyncClient:
+    def __init__(self, *_, **__):
+        self.responses = _FakeAsyncResponses()
+
+
+async def _flush_steps() -> None:
+    from chainlit.google import _step_queues
+
+    await asyncio.gather(*(flusher for _, flusher in list(_step_queues.values())))
+
+
 @pytest.fixture
 async def chainlit_context(mock_session):
     context = ChainlitContext(mock_session)
@@ -55,30 +75,48 @@ def cleanup_google_modules():
         sys.modules.update(originals)
 
 
-@pytest.mark.asyncio
-async def test_instrument_google_genai_records_step(monkeypatch, chainlit_context):
+@pytest.fixture
+def fake_genai_sdk():
+    """Install a fake ``google.genai`` package exposing the fake clients."""
+
     google_pkg = types.ModuleType("google")
     genai_pkg = types.ModuleType("google.genai")
     genai_pkg.Client = _FakeClient
+    genai_pkg.AsyncClient = _FakeAsyncClient
     google_pkg.genai = genai_pkg
     sys.modules["google"] = google_pkg
     sys.modules["google.genai"] = genai_pkg
+    return genai_pkg
+
 
-    recorded_steps = []
+@pytest.fixture
+def recorded_steps(monkeypatch):
+    """Capture the steps the instrumentation sends instead of emitting them."""
+
+    from chainlit.step import Step
+
+    recorded: List[Dict[str, Any]] = []
 
     async def fake_send(self):  # type: ignore[override]
-        recorded_steps.append(
+        recorded.append(
             {
                 "name": self.name,
                 "input": self.input,
                 "output": self.output,
                 "metadata": self.metadata,
+                "session_id": context_var.get().session.id,
             }
         )
         return self
 
-    monkeypatch.setattr("chainlit.step.Step.send", fake_send, raising=False)
+    monkeypatch.setattr(Step, "send", fake_send)
+    return recorded
+
 
+@pytest.mark.asyncio
+async def test_instrument_google_genai_records_step(
+    fake_genai_sdk, recorded_steps, chainlit_context
+):
     from chainlit.google import instrument_google_genai
 
     instrument_google_genai()
@@ -94,7 +132,7 @@ async def test_instrument_google_genai_records_step(monkeypatch, chainlit_contex
     assert response.output_text == "echo:hello world"
 
     # Let the instrumentation task execute.
-    await asyncio.sleep(0)
+    await _flush_steps()
 
     assert recorded_steps
     step = recorded_steps[0]
@@ -104,3 +142,238 @@ async def test_instrument_google_genai_records_step(monkeypatch, chainlit_contex
     assert step["metadata"]["provider"] == "google"
     assert step["metadata"]["interface"] == "responses"
     assert step["metadata"]["method"] == "generate"
+
+
+@pytest.mark.asyncio
+async def test_instrument_google_genai_wraps_async_methods(
+    fake_genai_sdk, recorded_steps, chainlit_context
+):
+    from chainlit.google import _wrap, instrument_google_genai
+
+    instrument_google_genai()
+
+    client = fake_genai_sdk.AsyncClient()
+    assert asyncio.iscoroutinefunction(client.responses.generate)
+    assert client.responses.generate.__name__ == "generate"
+    assert inspect.iscoroutinefunction(client.responses.generate.__wrapped__)
+
+    response = await client.responses.generate(
+        model="models/gemini-async", contents="hi"
+    )
+    assert response.output_text == "async:hi"
+
+    await _flush_steps()
+
+    assert [(step["name"], step["output"]) for step in recorded_steps] == [
+        ("models/gemini-async", "async:hi")
+    ]
+
+    streamed = _wrap(client.responses.stream, interface="responses", method="stream")
+    chunks = list(streamed(model="models/gemini-async", contents="hi"))
+    assert [chunk.output_text for chunk in chunks] == ["chunk:hi"]
+    assert len(recorded_steps) == 1
+
+
+@pytest.mark.asyncio
+async def test_google_genai_steps_flush_with_their_own_context(
+    fake_genai_sdk, recorded_steps, mock_session_factory
+):
+    from chainlit.google import instrument_google_genai
+
+    instrument_google_genai()
+    client = fake_genai_sdk.Client()
+
+    for session_id in ("first", "second", "third"):
+        context = ChainlitContext(mock_session_factory(id=session_id))
+        token = context_var.set(context)
+        try:
+            client.responses.generate(model="models/gemini", contents=session_id)
+        finally:
+            context_var.reset(token)
+
+    await _flush_steps()
+
+    assert [(step["input"], step["session_id"]) for step in recorded_steps] == [
+        ("first", "first"),
+        ("second", "second"),
+        ("third", "third"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_google_genai_slow_step_does_not_hold_back_other_sessions(
+    monkeypatch, fake_genai_sdk, mock_session_factory
+):
+    release_slow = asyncio.Event()
+    fast_sent = asyncio.Event()
+    sent = []
+
+    async def fake_send(self):  # type: ignore[override]
+        if self.input == "slow":
+            await release_slow.wait()
+        else:
+            fast_sent.set()
+        sent.append(self.input)
+        return self
+
+    from chainlit.step import Step
+
+    monkeypatch.setattr(Step, "send", fake_send)
+
+    from chainlit.google import instrument_google_genai
+
+    instrument_google_genai()
+    client = fake_genai_sdk.Client()
+
+    for contents in ("slow", "fast"):
+        token = context_var.set(ChainlitContext(mock_session_factory(id=contents)))
+        try:
+            client.responses.generate(model="models/gemini", contents=contents)
+        finally:
+            context_var.reset(token)
+
+    await asyncio.wait_for(fast_sent.wait(), timeout=1)
+    assert sent == ["fast"]
+
+    release_slow.set()
+    await _flush_steps()
+
+    assert sent == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_google_genai_skips_recording_outside_chainlit_context(
+    monkeypatch, fake_genai_sdk
+):
+    import chainlit.google as google_instrumentation
+
+    def fail_extract(*_args, **_kwargs):
+        raise AssertionError("extractors should not run without a context")
+
+    monkeypatch.setattr(google_instrumentation, "_extract_model", fail_extract)
+
+    google_instrumentation.instrument_google_genai()
+    client = fake_genai_sdk.Client()
+
+    response = client.responses.generate(model="models/gemini", contents="hi")
+
+    assert response.output_text == "echo:hi"
+    assert not google_instrumentation._step_queues
+
+
+def test_simplify_converts_nested_values_with_a_depth_limit():
+    from chainlit.google import _simplify
+
+    class _Part:
+        def __init__(self, text: str):
+            self.text = text
+            self._private = "hidden"
+
+    class _Node:
+        def __init__(self):
+            self.child = self
+
+    assert _simplify(
+        {"parts": (_Part("a"), _Part("b")), 1: {"ids": {7}}, "none": None}
+    ) == {"parts": [{"text": "a"}, {"text": "b"}], "1": {"ids": [7]}, "none": None}
+
+    assert _simplify([[["deep"]]], max_depth=1) == [["['deep']"]]
+
+    # Self-referencing objects are cut off at the depth limit instead of
+    # looping forever.
+    simplified = _simplify(_Node(), max_depth=3)
+    assert isinstance(simplified["child"]["child"]["child"], dict)
+    assert isinstance(simplified["child"]["child"]["child"]["child"], str)
+
+
+def test_instrumented_methods_are_cached_per_component_class():
+    from chainlit.google import (
+        _COMPONENT_METHODS,
+        _STEP_SENTINEL_ATTR,
+        _instrument_client_instance,
+    )
+
+    first, second = _FakeClient(), _FakeClient()
+    _instrument_client_instance(first)
+    _instrument_client_instance(second)
+
+    assert _COMPONENT_METHODS[_FakeResponses] == {"responses": ("generate",)}
+    for client in (first, second):
+        assert getattr(client.responses.generate, _STEP_SENTINEL_ATTR, False)
+
+
+def test_instrument_google_genai_is_idempotent_for_legacy_sdk():
+    google_pkg = types.ModuleType("google")
+    legacy_pkg = types.ModuleType("google.generativeai")
+
+    def generate_content(prompt: str):
+        return _FakeResponse(model="models/legacy", text=prompt)
+
+    legacy_pkg.generate_content = generate_content
+    google_pkg.generativeai = legacy_pkg
+    sys.modules["google"] = google_pkg
+    sys.modules["google.generativeai"] = legacy_pkg
+
+    from chainlit.google import _STEP_SENTINEL_ATTR, instrument_google_genai
+
+    instrument_google_genai()
+    wrapped = legacy_pkg.generate_content
+    instrument_google_genai()
+
+    assert legacy_pkg.generate_content is wrapped
+    assert getattr(wrapped, _STEP_SENTINEL_ATTR, False)
+    assert wrapped("hi").output_text == "hi"
+
+
+def test_extract_output_prefers_text_over_candidates():
+    from chainlit.google import _extract_output
+
+    class _Part:
+        def __init__(self, text: str):
+            self.text = text
+
+    class _Candidate:
+        def __init__(self, text: str):
+            self.content = types.SimpleNamespace(parts=[_Part(text)])
+
+    class _Response:
+        def __init__(self, text: str = "", candidates=()):
+            self.text = text
+            self.candidates = candidates
+
+    assert _extract_output(_Response(text="direct")) == "direct"
+
+    streamed = _Response(candidates=[_Candidate("a"), _Candidate("b")])
+    assert _extract_output(streamed) == "a\nb"
+    assert _extract_output(_Response(text="again")) == "again"
+    assert _extract_output("plain") == "plain"
+
+    # A response of the same type that fills both fields still prefers text,
+    # even right after one that only had candidates.
+    assert _extract_output(_Response(candidates=[_Candidate("partial")])) == "partial"
+    both = _Response(text="final text", candidates=[_Candidate("partial")])
+    assert _extract_output(both) == "final text"
+
+
+@pytest.mark.asyncio
+async def test_google_genai_skips_empty_housekeeping_steps(
+    recorded_steps, chainlit_context
+):
+    from chainlit.google import _wrap
+
+    class _FakeAgents:
+        def delete(self, name: str):
+            return None
+
+        def query(self, name: str):
+            return None
+
+    agents = _FakeAgents()
+    delete = _wrap(agents.delete, interface="agents", method="delete")
+    query = _wrap(agents.query, interface="agents", method="query")
+
+    delete(name="agent-1")
+    query(name="agent-1")
+    await _flush_steps()
+
+    assert [step["metadata"]["method"] for step in recorded_steps] == ["query"]
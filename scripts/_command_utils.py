@@ -7,36 +7,63 @@ from pathlib import Path
 from typing import Sequence
 
 
-def run_command(command: Sequence[str], cwd: Path | None = None) -> bool:
-    """Execute a command, returning ``True`` on success."""
+def run_command(
+    command: Sequence[str], cwd: Path | None = None, *, prefix: str | None = None
+) -> bool:
+    """Execute a command, returning ``True`` on success.
+
+    When ``prefix`` is provided the command output is captured and echoed line by
+    line with a ``[prefix]`` tag so concurrently running commands stay readable.
+    """
 
-    print(f"\n→ {' '.join(command)}")
+    tag = f"[{prefix}] " if prefix else ""
+    print(f"\n{tag}→ {' '.join(command)}")
     try:
-        subprocess.run(command, cwd=cwd, check=True)
+        if prefix:
+            _run_prefixed(command, cwd=cwd, tag=tag)
+        else:
+            subprocess.run(command, cwd=cwd, check=True)
     except FileNotFoundError:
         print(
-            f"  ! Command '{command[0]}' is not available. Install it or rerun without the current option."
+            f"  ! {tag}Command '{command[0]}' is not available. Install it or rerun without the current option."
         )
         return False
     except subprocess.CalledProcessError as exc:
-        print(f"  ! Command failed with exit code {exc.returncode}.")
+        print(f"  ! {tag}Command failed with exit code {exc.returncode}.")
         return False
     return True
 
 
+def _run_prefixed(command: Sequence[str], *, cwd: Path | None, tag: str) -> None:
+    with subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=-1,
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            print(f"   {tag}{line.decode(errors='replace').rstrip()}")
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, list(command))
+
+
 def attempt_with_fallback(
     primary: Sequence[str],
     fallback: Sequence[str],
     *,
     cwd: Path | None = None,
+    prefix: str | None = None,
 ) -> bool:
     """Run ``primary`` and fall back to ``fallback`` if it fails."""
 
-    if run_command(primary, cwd=cwd):
+    if run_command(primary, cwd=cwd, prefix=prefix):
         return True
 
-    print(f"  ! Falling back to '{' '.join(fallback)}' for developer convenience.")
-    return run_command(fallback, cwd=cwd)
+    tag = f"[{prefix}] " if prefix else ""
+    print(f"  ! {tag}Falling back to '{' '.join(fallback)}' for developer convenience.")
+    return run_command(fallback, cwd=cwd, prefix=prefix)
 
 
 __all__ = ["attempt_with_fallback", "run_command"]
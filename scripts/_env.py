@@ -2,28 +2,54 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 from . import REPO_ROOT
 
 ENV_TEMPLATE = REPO_ROOT / ".env.example"
 ENV_FILE = REPO_ROOT / ".env"
 
+# Matches ``KEY=value`` assignments with surrounding whitespace stripped from
+# both sides. Blank lines, comments, and lines without ``=`` never match.
+_ENV_LINE_RE = re.compile(
+    r"^[^\S\n]*(?:([^\s#=][^=\n]*?)[^\S\n]*)?=[^\S\n]*(.*?)[^\S\n]*$",
+    re.MULTILINE,
+)
+
+_PARSE_CACHE: Dict[Path, Tuple[int, int, Dict[str, str]]] = {}
+
 
 def parse_env_file(path: Path) -> Dict[str, str]:
-    """Return key/value pairs from an env-style file."""
+    """Return key/value pairs from an env-style file.
 
-    values: Dict[str, str] = {}
-    if not path.exists():
-        return values
+    Results are memoized per path and reused while the file's modification time
+    and size are unchanged, so repeated reads of the same file are free.
+    """
 
-    for raw_line in path.read_text().splitlines():
-        if raw_line.strip().startswith("#") or "=" not in raw_line:
-            continue
-        key, value = raw_line.split("=", 1)
-        values[key.strip()] = value.strip()
-    return values
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {}
+
+    cached = _PARSE_CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return dict(cached[2])
+
+    # The whole file is decoded once and scanned with the same pattern as
+    # ``parse_env_text`` so both agree on what counts as whitespace.
+    values = parse_env_text(path.read_text())
+    _PARSE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, values)
+    return dict(values)
+
+
+def parse_env_text(text: str) -> Dict[str, str]:
+    """Return key/value pairs from env-style content that is already loaded."""
+
+    return {
+        match.group(1) or "": match.group(2) for match in _ENV_LINE_RE.finditer(text)
+    }
 
 
 def merge_template(
@@ -33,20 +59,26 @@ def merge_template(
 ) -> str:
     """Render env content based on template lines and provided values."""
 
-    rendered: List[str] = []
+    return "\n".join(_render_template(template_lines, values, extras)).strip() + "\n"
+
+
+def _render_template(
+    template_lines: Iterable[str],
+    values: Dict[str, str],
+    extras: List[str],
+) -> Iterator[str]:
     for raw_line in template_lines:
-        if raw_line.strip().startswith("#") or "=" not in raw_line:
-            rendered.append(raw_line.rstrip())
+        match = _ENV_LINE_RE.match(raw_line)
+        if match is None:
+            yield raw_line.rstrip()
             continue
-        key = raw_line.split("=", 1)[0].strip()
-        rendered.append(f"{key}={values.get(key, '')}")
+        key = match.group(1) or ""
+        yield f"{key}={values.get(key, '')}"
 
     if extras:
-        rendered.append("")
-        rendered.append("# Additional entries preserved from existing .env")
-        rendered.extend(extras)
-
-    return "\n".join(rendered).strip() + "\n"
+        yield ""
+        yield "# Additional entries preserved from existing .env"
+        yield from extras
 
 
 def preserve_extra_lines(
@@ -55,10 +87,10 @@ def preserve_extra_lines(
     template_key_set = {key.strip() for key in template_keys}
     extras: List[str] = []
     for raw_line in existing_lines:
-        if raw_line.strip().startswith("#") or "=" not in raw_line:
+        match = _ENV_LINE_RE.match(raw_line)
+        if match is None:
             continue
-        key = raw_line.split("=", 1)[0].strip()
-        if key not in template_key_set:
+        if (match.group(1) or "") not in template_key_set:
             extras.append(raw_line.rstrip())
     return extras
 
@@ -68,5 +100,6 @@ __all__ = [
     "ENV_TEMPLATE",
     "merge_template",
     "parse_env_file",
+    "parse_env_text",
     "preserve_extra_lines",
 ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import os
 import shutil
 import subprocess
@@ -14,45 +16,76 @@ PROJECT_ENV_CANDIDATES = ("GCP_PROJECT_ID", "VERTEX_PROJECT_ID")
 GCLOUD_CONFIG_PROJECT_KEYS = ("core/project", "core/project_id")
 
 
-def run_gcloud(args: Iterable[str], *, capture_output: bool = False) -> subprocess.CompletedProcess:
-    """Execute a gcloud command while echoing the invocation."""
+def run_gcloud(
+    args: Iterable[str],
+    *,
+    capture_output: bool = False,
+    input: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Execute a gcloud command while echoing the invocation.
+
+    ``input`` is written to the command's stdin, which lets callers stream data
+    to flags such as ``--data-file=-`` without staging it on disk.
+    """
 
     command = ["gcloud", *args]
     print(f"\n→ {' '.join(command)}")
+    # Launch the already-resolved executable so PATH is not searched again.
+    # An absolute path plus ``close_fds=False`` lets CPython use posix_spawn
+    # instead of fork/exec; descriptors opened by Python are non-inheritable
+    # (PEP 446), so nothing leaks into gcloud.
+    executable = gcloud_path() or "gcloud"
     return subprocess.run(
-        command,
+        [executable, *command[1:]],
         check=False,
+        close_fds=False,
         capture_output=capture_output,
+        input=input,
         text=True,
     )
 
 
+def gcloud_path() -> Optional[str]:
+    """Return the gcloud executable resolved from the current PATH."""
+
+    return _which_gcloud(os.environ.get("PATH"))
+
+
+@functools.lru_cache(maxsize=4)
+def _which_gcloud(path_env: Optional[str]) -> Optional[str]:
+    # Keyed on PATH so the lookup is redone only when PATH itself changes.
+    return shutil.which("gcloud", path=path_env)
+
+
 def gcloud_available() -> bool:
     """Return True when the gcloud CLI is present on PATH."""
 
-    return shutil.which("gcloud") is not None
+    return gcloud_path() is not None
 
 
+@functools.lru_cache(maxsize=1)
 def read_gcloud_project() -> Optional[Tuple[str, str]]:
     """Return the active gcloud project and the config key it came from."""
 
     if not gcloud_available():
         return None
 
+    # A single `config list` call returns every section, so all candidate keys
+    # can be checked without spawning gcloud once per key.
+    result = run_gcloud(["config", "list", "--format=json", "--quiet"], capture_output=True)
+    if result.returncode != 0:
+        return None
+
+    try:
+        config = json.loads(result.stdout or "{}")
+    except json.JSONDecodeError:
+        return None
+
     for key in GCLOUD_CONFIG_PROJECT_KEYS:
-        result = run_gcloud(
-            ["config", "get-value", key, "--quiet"],
-            capture_output=True,
-        )
-        candidate = result.stdout.strip()
-        if result.returncode == 0 and candidate:
-            return candidate, key
-
-    result = run_gcloud(["config", "list", "--format=value(core.project)", "--quiet"], capture_output=True)
-    if result.returncode == 0:
-        candidate = result.stdout.strip()
-        if candidate:
-            return candidate, "config list"
+        section, name = key.split("/", 1)
+        candidate = (config.get(section) or {}).get(name)
+        if isinstance(candidate, str) and candidate.strip():
+            return candidate.strip(), key
 
     return None
 
@@ -110,6 +143,7 @@ __all__ = [
     "PROJECT_ENV_CANDIDATES",
     "GCLOUD_CONFIG_PROJECT_KEYS",
     "gcloud_available",
+    "gcloud_path",
     "log_source",
     "read_gcloud_project",
     "resolve_setting",
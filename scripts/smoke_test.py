@@ -4,15 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
+import select
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from http.client import HTTPConnection, HTTPException
 from pathlib import Path
-from typing import Optional, Sequence
-from urllib.error import URLError
-from urllib.request import urlopen
+from typing import IO, Optional, Sequence
+from urllib.parse import urlsplit
 
 if __package__ is None:  # pragma: no cover - executed when run as a script
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -21,7 +26,17 @@ from scripts import REPO_ROOT
 from scripts._command_utils import attempt_with_fallback
 
 READINESS_PHRASE = "Your app is available at"
+_READINESS_BYTES = READINESS_PHRASE.encode()
 DEFAULT_PYTHON_EXTRAS: tuple[str, ...] = ("mypy",)
+_READ_CHUNK_SIZE = 65536
+_DRAIN_JOIN_TIMEOUT = 5.0
+# select() only accepts sockets on Windows, so pipes are read blocking there,
+# as the line-based loop used to do.
+_CAN_SELECT_PIPES = os.name != "nt"
+INSTALL_LOCKFILES = (REPO_ROOT / "pnpm-lock.yaml", REPO_ROOT / "backend" / "uv.lock")
+# Lives inside the uv virtualenv so removing the environment also forces the
+# next smoke test to reinstall.
+INSTALL_STAMP = REPO_ROOT / "backend" / ".venv" / ".chainlit-smoke-install.stamp"
 
 
 def _build_uv_sync_command(*, frozen: bool, extras: Sequence[str]) -> list[str]:
@@ -38,19 +53,34 @@ def _build_uv_sync_command(*, frozen: bool, extras: Sequence[str]) -> list[str]:
 def _probe_http(url: str, timeout: float) -> bool:
     """Poll ``url`` until it responds with a 2xx/3xx status."""
 
+    parts = urlsplit(url)
+    path = parts.path or "/"
     deadline = time.monotonic() + timeout
     last_error: Optional[Exception] = None
-    while time.monotonic() < deadline:
-        try:
-            with urlopen(url) as response:  # nosec - internal smoke test
-                if 200 <= response.status < 400:
-                    return True
-        except URLError as exc:  # pragma: no cover - exercised in runtime smoke tests
-            last_error = exc
-            time.sleep(0.5)
-        except Exception as exc:  # pragma: no cover - broad guard for CI environments
-            last_error = exc
+    # Reuse one keep-alive connection across probes and only reconnect after a
+    # failure, instead of opening a new socket for every attempt.
+    connection: Optional[HTTPConnection] = None
+    try:
+        while time.monotonic() < deadline:
+            if connection is None:
+                connection = HTTPConnection(
+                    parts.hostname or "127.0.0.1", parts.port, timeout=1.0
+                )
+            try:
+                connection.request("GET", path)
+                with connection.getresponse() as response:
+                    response.read()
+                    if 200 <= response.status < 400:
+                        return True
+                    last_error = HTTPException(f"HTTP {response.status}")
+            except Exception as exc:  # pragma: no cover - exercised in runtime smoke tests
+                last_error = exc
+                connection.close()
+                connection = None
             time.sleep(0.5)
+    finally:
+        if connection is not None:
+            connection.close()
 
     if last_error:
         print(f"  ! HTTP readiness probe failed for {url}: {last_error}")
@@ -67,10 +97,33 @@ def _terminate_process(
 
     process.terminate()
     try:
-        process.wait(timeout=timeout)
+        _wait_for_exit(process, timeout)
     except subprocess.TimeoutExpired:  # pragma: no cover - defensive guard
         process.kill()
+        _wait_for_exit(process, timeout)
+
+
+def _wait_for_exit(process: subprocess.Popen[bytes], timeout: float) -> None:
+    """Block until ``process`` exits, using a pidfd instead of polling on Linux."""
+
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
         process.wait(timeout=timeout)
+        return
+
+    try:
+        pidfd = pidfd_open(process.pid)
+    except OSError:
+        process.wait(timeout=timeout)
+        return
+
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        poller.poll(timeout * 1000)
+    finally:
+        os.close(pidfd)
+    process.wait(timeout=0)
 
 
 def _run_chainlit_hello(timeout: float) -> bool:
@@ -85,7 +138,7 @@ def _run_chainlit_hello(timeout: float) -> bool:
             cwd=REPO_ROOT,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
+            bufsize=-1,
         )
     except FileNotFoundError:
         print(
@@ -106,21 +159,35 @@ def _run_chainlit_hello(timeout: float) -> bool:
 
     readiness_deadline = time.monotonic() + timeout
     ready = False
+    drain: Optional[threading.Thread] = None
     assert process.stdout is not None
 
+    # Output stays as bytes; lines are split on b"\n", which never falls inside
+    # a UTF-8 sequence, and only decoded when echoed.
+    pending = b""
+
     try:
-        while time.monotonic() < readiness_deadline:
-            if process.poll() is not None:
+        while not ready:
+            remaining = readiness_deadline - time.monotonic()
+            if remaining <= 0 or process.poll() is not None:
+                break
+
+            if _CAN_SELECT_PIPES:
+                readable, _, _ = select.select(
+                    [process.stdout], [], [], min(0.5, remaining)
+                )
+                if not readable:
+                    continue
+
+            chunk = process.stdout.read1(_READ_CHUNK_SIZE)
+            if not chunk:
                 break
 
-            line = process.stdout.readline()
-            if line:
-                print(f"   {line.rstrip()}")
-                if READINESS_PHRASE in line:
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                _echo_line(line)
+                if _READINESS_BYTES in line:
                     ready = True
-                    break
-            else:
-                time.sleep(0.1)
 
         if not ready:
             print(
@@ -129,6 +196,15 @@ def _run_chainlit_hello(timeout: float) -> bool:
             )
             return False
 
+        # Keep emptying the pipe while probing; otherwise a chatty server blocks
+        # on a full pipe buffer and never answers the probe.
+        drain = threading.Thread(
+            target=_drain_output,
+            args=(process.stdout, pending),
+            daemon=True,
+        )
+        drain.start()
+
         if not _probe_http(base_url, timeout=15):
             return False
 
@@ -137,8 +213,97 @@ def _run_chainlit_hello(timeout: float) -> bool:
     finally:
         with suppress(Exception):
             _terminate_process(process)
-        with suppress(Exception):
-            process.stdout.close()
+        if drain is not None:
+            drain.join(timeout=_DRAIN_JOIN_TIMEOUT)
+        # A drain thread still blocked on a pipe held open by a grandchild owns
+        # the stream's lock, so leave closing it to interpreter shutdown.
+        if drain is None or not drain.is_alive():
+            with suppress(Exception):
+                process.stdout.close()
+
+
+def _drain_output(stream: IO[bytes], pending: bytes) -> None:
+    """Echo the remaining child output until the pipe reaches EOF."""
+
+    with suppress(OSError, ValueError):
+        while chunk := stream.read1(_READ_CHUNK_SIZE):
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                _echo_line(line)
+
+    if pending.strip():
+        _echo_line(pending)
+
+
+def _echo_line(line: bytes) -> None:
+    print(f"   {line.decode('utf-8', 'replace').rstrip()}")
+
+
+def _install_dependencies(extras: Sequence[str]) -> bool:
+    """Run pnpm install and uv sync, recording an install stamp on success."""
+
+    # pnpm and uv install into separate trees with their own caches, so the
+    # two installs can run side by side.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        js_install = executor.submit(
+            attempt_with_fallback,
+            ["pnpm", "install", "--frozen-lockfile"],
+            ["pnpm", "install"],
+            cwd=REPO_ROOT,
+            prefix="pnpm",
+        )
+        py_install = executor.submit(
+            attempt_with_fallback,
+            _build_uv_sync_command(frozen=True, extras=extras),
+            _build_uv_sync_command(frozen=False, extras=extras),
+            cwd=REPO_ROOT / "backend",
+            prefix="uv",
+        )
+        success = js_install.result() and py_install.result()
+
+    if success:
+        # Fingerprint after installing: the unfrozen fallbacks may rewrite the
+        # lockfiles.
+        fingerprint = _install_fingerprint(extras)
+        if fingerprint is not None:
+            _write_install_stamp(fingerprint)
+    return success
+
+
+def _install_fingerprint(extras: Sequence[str]) -> Optional[str]:
+    """Hash the lockfiles and extras that determine the installed dependencies."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for lockfile in INSTALL_LOCKFILES:
+        try:
+            digest.update(lockfile.read_bytes())
+        except OSError:
+            return None
+        digest.update(b"\0")
+    digest.update(",".join(extras).encode())
+    return digest.hexdigest()
+
+
+def _installs_up_to_date(fingerprint: Optional[str]) -> bool:
+    if fingerprint is None or not (REPO_ROOT / "node_modules").is_dir():
+        return False
+    try:
+        return INSTALL_STAMP.read_text().strip() == fingerprint
+    except OSError:
+        return False
+
+
+def _write_install_stamp(fingerprint: str) -> None:
+    # Write to a sibling file and rename it into place so an interrupted run
+    # never leaves a truncated stamp behind.
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=INSTALL_STAMP.parent, delete=False
+        ) as tmp:
+            tmp.write(fingerprint)
+        os.replace(tmp.name, INSTALL_STAMP)
+    except OSError as exc:
+        print(f"  ! Could not record the install stamp at {INSTALL_STAMP}: {exc}")
 
 
 def run_smoke_test(
@@ -152,24 +317,17 @@ def run_smoke_test(
     By default the helper syncs the ``mypy`` extra so dmypy has the stubs it
     needs for the Husky `pnpm run lintPython` hook. Override ``python_extras``
     to install a custom set of extras or pass an empty tuple to skip them
-    entirely.
+    entirely. Installs are skipped when the lockfiles and extras match the
+    stamp recorded by the last successful install.
     """
 
     extras = tuple(python_extras) if python_extras is not None else DEFAULT_PYTHON_EXTRAS
-    success = True
     if install:
-        js_success = attempt_with_fallback(
-            ["pnpm", "install", "--frozen-lockfile"],
-            ["pnpm", "install"],
-            cwd=REPO_ROOT,
-        )
-        py_success = attempt_with_fallback(
-            _build_uv_sync_command(frozen=True, extras=extras),
-            _build_uv_sync_command(frozen=False, extras=extras),
-            cwd=REPO_ROOT / "backend",
-        )
-        success = js_success and py_success
-        if not success:
+        if _installs_up_to_date(_install_fingerprint(extras)):
+            print(
+                "\nDependencies already match the lockfiles. Skipping pnpm install and uv sync."
+            )
+        elif not _install_dependencies(extras):
             print(
                 "\nDependency installation failed. Resolve the issues above and rerun the smoke test."
             )
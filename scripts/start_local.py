@@ -18,13 +18,15 @@ from scripts._env import (
     ENV_TEMPLATE,
     merge_template,
     parse_env_file,
+    parse_env_text,
     preserve_extra_lines,
 )
 from scripts.smoke_test import run_smoke_test
 
 
-def _collect_env_values(non_interactive: bool) -> Tuple[Dict[str, str], List[str]]:
-    template_values = parse_env_file(ENV_TEMPLATE)
+def _collect_env_values(
+    template_values: Dict[str, str], non_interactive: bool
+) -> Tuple[Dict[str, str], List[str]]:
     if not template_values:
         raise SystemExit(
             "Expected .env.example to describe environment variables. "
@@ -76,11 +78,15 @@ def _collect_env_values(non_interactive: bool) -> Tuple[Dict[str, str], List[str
     return collected, missing_required
 
 
-def write_env_file(values: Dict[str, str]) -> None:
-    template_lines = ENV_TEMPLATE.read_text().splitlines()
+def write_env_file(
+    values: Dict[str, str],
+    *,
+    template_lines: List[str],
+    template_keys: Iterable[str],
+) -> None:
     extras = preserve_extra_lines(
         ENV_FILE.read_text().splitlines() if ENV_FILE.exists() else [],
-        parse_env_file(ENV_TEMPLATE).keys(),
+        template_keys,
     )
     content = merge_template(template_lines, values, extras)
     try:
@@ -98,8 +104,7 @@ def _summarize_missing(missing: Iterable[str]) -> None:
         return
 
     print("\n⚠️  The following variables remain empty in .env:")
-    for key in missing_list:
-        print(f"   - {key}")
+    print("\n".join(f"   - {key}" for key in missing_list))
     print(
         "Populate them later (for example via `direnv`, Secret Manager, or by rerunning this script) "
         "before connecting to providers that require them."
@@ -127,13 +132,24 @@ def main() -> None:
             "Missing .env.example. Create it with the required variables before running this script."
         )
 
-    values, missing = _collect_env_values(non_interactive=args.non_interactive)
-    write_env_file(values)
+    # Read and parse the template once; both prompting and rendering use it.
+    template_text = ENV_TEMPLATE.read_text()
+    template_values = parse_env_text(template_text)
+    values, missing = _collect_env_values(
+        template_values, non_interactive=args.non_interactive
+    )
+    write_env_file(
+        values,
+        template_lines=template_text.splitlines(),
+        template_keys=template_values.keys(),
+    )
     _summarize_missing(missing)
 
-    # Ensure child processes inherit the configured environment variables.
+    # Ensure child processes inherit the configured environment variables. Only
+    # keys whose value differs are written, since each assignment calls putenv.
     for key, value in values.items():
-        os.environ[key] = value
+        if os.environ.get(key) != value:
+            os.environ[key] = value
 
     if args.smoke_test:
         success = run_smoke_test()
@@ -4,10 +4,10 @@
 from __future__ import annotations
 
 import argparse
+import re
 import sys
-import tempfile
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 if __package__ is None:  # pragma: no cover - executed when run as a script
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -26,18 +26,28 @@ DEFAULT_PROJECT_ENV = "GCP_PROJECT_ID"
 DEFAULT_SECRET_ENV = "CHAINLIT_SECRET_NAME"
 DEFAULT_REPLICA_ENV = "GCP_SECRET_MANAGER_REPLICA_LOCATION"
 
+# gcloud reports a missing secret with a NOT_FOUND status on stderr.
+_SECRET_NOT_FOUND_RE = re.compile(r"NOT_FOUND|was not found")
+
 
 def _build_payload(
     template: Dict[str, str],
     values: Dict[str, str],
     *,
     include_empty: bool,
-) -> List[str]:
-    """Render a Secret Manager payload honoring the template order."""
+) -> Tuple[List[str], List[str]]:
+    """Render a Secret Manager payload honoring the template order.
+
+    Returns the payload lines together with the template keys that have no
+    value, so callers can report them without walking the template again.
+    """
 
     payload: List[str] = []
+    missing: List[str] = []
     for key in template:
         value = values.get(key, "")
+        if not value:
+            missing.append(key)
         if value or include_empty:
             payload.append(f"{key}={value}")
 
@@ -47,59 +57,7 @@ def _build_payload(
         if value or include_empty:
             payload.append(f"{key}={value}")
 
-    return payload
-def _secret_exists(project: str, secret: str) -> bool:
-    result = run_gcloud(
-        [
-            "secrets",
-            "describe",
-            secret,
-            "--project",
-            project,
-            "--format=value(name)",
-            "--quiet",
-        ],
-        capture_output=True,
-    )
-    return result.returncode == 0
-
-
-def _resolve_setting(
-    cli_value: Optional[str],
-    *,
-    candidate_keys: Iterable[str],
-    env_file_values: Dict[str, str],
-) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
-    """Determine the effective configuration value and where it came from."""
-
-    if cli_value:
-        return cli_value, None
-
-    for key in candidate_keys:
-        env_value = os.environ.get(key)
-        if env_value:
-            return env_value, ("env", key)
-
-        file_value = env_file_values.get(key, "")
-        if file_value:
-            return file_value, ("file", key)
-
-    return None, None
-
-
-def _log_source(name: str, source: Optional[Tuple[str, str]], source_path: Path) -> None:
-    if not source:
-        return
-
-    origin, key = source
-    if origin == "env":
-        print(f"Using {name} from environment variable {key}.")
-    elif origin == "file":
-        try:
-            relative = source_path.relative_to(REPO_ROOT)
-        except ValueError:
-            relative = source_path
-        print(f"Using {name} from {relative} entry {key}.")
+    return payload, missing
 
 
 def _create_secret(project: str, secret: str, replica_location: str | None) -> None:
@@ -116,12 +74,14 @@ def _create_secret(project: str, secret: str, replica_location: str | None) -> N
         command.append("--replication-policy=automatic")
 
     result = run_gcloud(command)
-    result = _run_gcloud(command)
     if result.returncode != 0:
         raise SystemExit(f"Failed to create secret '{secret}' in project '{project}'.")
 
 
-def _add_secret_version(project: str, secret: str, data_path: Path) -> None:
+def _add_secret_version(project: str, secret: str, payload: str) -> bool:
+    """Upload a new secret version, returning ``False`` when the secret is missing."""
+
+    # Stream the payload over stdin so the secret never touches the filesystem.
     result = run_gcloud(
         [
             "secrets",
@@ -130,13 +90,21 @@ def _add_secret_version(project: str, secret: str, data_path: Path) -> None:
             secret,
             "--project",
             project,
-            f"--data-file={data_path}",
-        ]
+            "--data-file=-",
+        ],
+        capture_output=True,
+        input=payload,
     )
+    if result.returncode != 0 and _SECRET_NOT_FOUND_RE.search(result.stderr or ""):
+        return False
+
+    sys.stdout.write(result.stdout or "")
+    sys.stderr.write(result.stderr or "")
     if result.returncode != 0:
         raise SystemExit(
             f"Failed to add a new version for secret '{secret}'. See the gcloud output above for details."
         )
+    return True
 
 
 def main() -> None:
@@ -190,9 +158,6 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    if shutil.which("gcloud") is None:
-        raise SystemExit("gcloud CLI is required. Install it and authenticate before syncing secrets.")
-
     if not ENV_TEMPLATE.exists():
         raise SystemExit("Missing .env.example. Populate it before mirroring secrets to GCP.")
 
@@ -213,10 +178,6 @@ def main() -> None:
         candidate_keys=PROJECT_ENV_CANDIDATES,
         env_file_values=env_values,
         allow_gcloud_fallback=not args.dry_run,
-    project, project_source = _resolve_setting(
-        args.project,
-        candidate_keys=(DEFAULT_PROJECT_ENV, "VERTEX_PROJECT_ID"),
-        env_file_values=env_values,
     )
     if not project:
         raise SystemExit(
@@ -225,9 +186,6 @@ def main() -> None:
     log_source("project", project_source, source_path)
 
     secret, secret_source = resolve_setting(
-    _log_source("project", project_source, source_path)
-
-    secret, secret_source = _resolve_setting(
         args.secret,
         candidate_keys=(DEFAULT_SECRET_ENV,),
         env_file_values=env_values,
@@ -239,52 +197,47 @@ def main() -> None:
     log_source("secret", secret_source, source_path)
 
     replica_location, replica_source = resolve_setting(
-    _log_source("secret", secret_source, source_path)
-
-    replica_location, replica_source = _resolve_setting(
         args.replica_location,
         candidate_keys=(DEFAULT_REPLICA_ENV,),
         env_file_values=env_values,
     )
     log_source("replica location", replica_source, source_path)
-    _log_source("replica location", replica_source, source_path)
 
-    missing_required = [key for key in template_values if not env_values.get(key)]
+    payload_lines, missing_required = _build_payload(
+        template_values, env_values, include_empty=args.include_empty
+    )
     if missing_required and not args.include_empty:
         print(
             "\n⚠️  The following keys are empty and will be skipped. Rerun the local bootstrapper or pass --include-empty if you "
             "intend to clear them in Secret Manager:"
         )
-        for key in missing_required:
-            print(f"   - {key}")
+        print("\n".join(f"   - {key}" for key in missing_required))
 
-    payload_lines = _build_payload(template_values, env_values, include_empty=args.include_empty)
     if not payload_lines:
         raise SystemExit("Nothing to upload after filtering empty values. Populate .env and rerun.")
+    # Render the payload once; the dry run and any upload retry reuse it.
+    payload = "\n".join(payload_lines) + "\n"
 
     if args.dry_run:
         print("\nDry run – payload that would be uploaded:\n")
-        print("\n".join(payload_lines))
+        print(payload, end="")
         return
 
     if not gcloud_available():
         raise SystemExit("gcloud CLI is required. Install it and authenticate before syncing secrets.")
 
-    if not _secret_exists(project, secret):
+    # Try the upload first so reruns against an existing secret cost a single
+    # gcloud call; only a NOT_FOUND response triggers creation.
+    if not _add_secret_version(project, secret, payload):
         if not args.create:
             raise SystemExit(
                 f"Secret '{secret}' does not exist in project '{project}'. Pass --create to provision it automatically."
             )
         _create_secret(project, secret, replica_location)
-
-    with tempfile.NamedTemporaryFile("w", delete=False) as tmp:
-        tmp.write("\n".join(payload_lines) + "\n")
-        tmp_path = Path(tmp.name)
-
-    try:
-        _add_secret_version(project, secret, tmp_path)
-    finally:
-        tmp_path.unlink(missing_ok=True)
+        if not _add_secret_version(project, secret, payload):
+            raise SystemExit(
+                f"Secret '{secret}' is still missing from project '{project}' after creating it."
+            )
 
     print(
         "\nSecret Manager updated successfully. Reference this secret from Cloud Build via availableSecrets and write the "